@@ -1,89 +1,79 @@
+import os
 import mpi4py
-import atexit
-
-from importlib.util import find_spec
+import importlib
+import importlib.metadata
 
 try:
     from ._git_hash import __git_hash__
 except ModuleNotFoundError:
     __git_hash__ = "unknown"
 
-__all__ = ["__git_hash__"]
-
 mpi4py.rc.initialize = False
 
 from mpi4py import MPI  # noqa: E402
 
-if MPI.Is_initialized() is False:
-    MPI.Init_thread(required=MPI.THREAD_FUNNELED)
-
-
-from .mpi import MPI_UTILS, Finalize, MPI_RAISE_EXCEPTION  # noqa: E402
-
-from . import base, _extensions, core, utilities, math  # noqa: E402
-
-from .base import TypeChangeWarning, LowerTypeCastWarning, ShapeError  # noqa: E402
-
-from .core import (  # noqa: E402
-    SolverType,
-    ProcessTimeSamples,
-    PointingLO,
-    BlockDiagonalPreconditionerLO,
-    NoiseCovLO_Diagonal,
-    InvNoiseCovLO_Diagonal,
-    NoiseCovLO_Circulant,
-    InvNoiseCovLO_Circulant,
-    NoiseCovLO_Toeplitz01,
-    InvNoiseCovLO_Toeplitz01,
-    BlockDiagNoiseCovLO,
-    BlockDiagInvNoiseCovLO,
-    GLSParameters,
-    GLSResult,
-    separate_map_vectors,
-    compute_GLS_maps_from_PTS,
-    compute_GLS_maps,
-)
-
-from .utilities import (  # noqa: E402
-    modify_numpy_context,
-)
-
-if find_spec("litebird_sim") is not None:
-    from . import lbsim
-    from .lbsim import (
-        LBSimProcessTimeSamples,
-        LBSim_InvNoiseCovLO_UnCorr,
-        LBSim_InvNoiseCovLO_Circulant,
-        LBSim_InvNoiseCovLO_Toeplitz,
-        LBSimGLSParameters,
-        LBSimGLSResult,
-        LBSim_compute_GLS_maps,
-    )
-
-    __all__ = __all__ + [
-        "lbsim",
-        "LBSimProcessTimeSamples",
-        "LBSim_InvNoiseCovLO_UnCorr",
-        "LBSim_InvNoiseCovLO_Circulant",
-        "LBSim_InvNoiseCovLO_Toeplitz",
-        "LBSimGLSParameters",
-        "LBSimGLSResult",
-        "LBSim_compute_GLS_maps",
-    ]
-
-
-__all__ = __all__ + [
+from .mpi import MPI_UTILS, Finalize, shutdown, MPI_RAISE_EXCEPTION  # noqa: E402, F401
+from .mpi import _initialize_MPI, _set_default_num_threads  # noqa: E402
+
+# MPI is initialized at import, unless the environment variable
+# `BRAHMAP_LAZY_MPI` is set. In that case, it is initialized only when
+# `MPI_UTILS` is used for the first time.
+if "BRAHMAP_LAZY_MPI" not in os.environ:
+    _initialize_MPI()
+
+    # Must be done before any submodule imports NumPy
+    _set_default_num_threads()
+
+
+def _find_litebird_sim() -> bool:
+    # Looking up the distribution metadata is cheaper than `find_spec()`,
+    # which goes through the whole chain of import finders
+    try:
+        importlib.metadata.distribution("litebird_sim")
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return True
+
+
+# Looking for `litebird_sim` touches the filesystem, which is slow on the
+# networked filesystems of HPC clusters. Therefore only the rank 0 looks for it
+# and broadcasts the result. If MPI is not initialized yet, every process looks
+# for it on its own instead. The lookup can be bypassed altogether by setting
+# the environment variable `BRAHMAP_ENABLE_LBSIM` to `1` or `0`.
+if "BRAHMAP_ENABLE_LBSIM" in os.environ:
+    _has_lbsim = os.environ["BRAHMAP_ENABLE_LBSIM"].lower() in ("1", "true", "yes")
+elif MPI.Is_initialized() is False:
+    _has_lbsim = _find_litebird_sim()
+else:
+    _has_lbsim = None
+    if MPI_UTILS.rank == 0:
+        _has_lbsim = _find_litebird_sim()
+    _has_lbsim = MPI_UTILS.comm.bcast(_has_lbsim, root=0)
+
+# Public names grouped by the submodule they come from. The first name of each
+# group is the submodule itself.
+_PUBLIC_MPI = (
     # ./mpi.py
     "MPI_UTILS",
     "Finalize",
+    "shutdown",
     "MPI_RAISE_EXCEPTION",
+)
+
+_PUBLIC_BASE = (
     # ./base/
     "base",
     "TypeChangeWarning",
     "LowerTypeCastWarning",
     "ShapeError",
+)
+
+_PUBLIC_EXTENSIONS = (
     # ./_extensions/
     "_extensions",
+)
+
+_PUBLIC_CORE = (
     # ./core/
     "core",
     "SolverType",
@@ -103,11 +93,64 @@ __all__ = __all__ + [
     "separate_map_vectors",
     "compute_GLS_maps_from_PTS",
     "compute_GLS_maps",
+)
+
+_PUBLIC_UTILITIES = (
     # ./utilities/
     "utilities",
     "modify_numpy_context",
+)
+
+_PUBLIC_MATH = (
     # ./math/
     "math",
-]
+)
+
+_PUBLIC_LBSIM = (
+    # ./lbsim/
+    "lbsim",
+    "LBSimProcessTimeSamples",
+    "LBSim_InvNoiseCovLO_UnCorr",
+    "LBSim_InvNoiseCovLO_Circulant",
+    "LBSim_InvNoiseCovLO_Toeplitz",
+    "LBSimGLSParameters",
+    "LBSimGLSResult",
+    "LBSim_compute_GLS_maps",
+)
+
+_LAZY_GROUPS = (
+    _PUBLIC_BASE,
+    _PUBLIC_EXTENSIONS,
+    _PUBLIC_CORE,
+    _PUBLIC_UTILITIES,
+    _PUBLIC_MATH,
+) + ((_PUBLIC_LBSIM,) if _has_lbsim else ())
+
+# The submodules and the objects re-exported from them are imported lazily,
+# on their first access (PEP 562). `_LAZY` maps each such name to the module
+# it has to be imported from. The submodules themselves map to `None`.
+_LAZY = {
+    name: None if name == group[0] else f"{__name__}.{group[0]}"
+    for group in _LAZY_GROUPS
+    for name in group
+}
+
+__all__ = ("__git_hash__",) + _PUBLIC_MPI + tuple(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    if _LAZY[name] is None:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        value = getattr(importlib.import_module(_LAZY[name]), name)
+
+    # Caching the object so that `__getattr__` is not called again for `name`
+    globals()[name] = value
+    return value
+
 
-atexit.register(Finalize)
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -40,39 +40,106 @@
 #
 # Licensed under the MIT License. See the <LICENSE.txt> file for details.
 
-from .misc import TypeChangeWarning, LowerTypeCastWarning, filter_warnings, ShapeError
+import importlib
+from typing import TYPE_CHECKING
 
-from .linop import (
-    BaseLinearOperator,
-    LinearOperator,
-    IdentityOperator,
-    DiagonalOperator,
-    MatrixLinearOperator,
-    ZeroOperator,
-    InverseLO,
-    ReducedLinearOperator,
-    SymmetricallyReducedLinearOperator,
-    aslinearoperator,
-    null_log,
-)
+# The objects are imported lazily from the submodules defining them, on their
+# first access (PEP 562). `_SRC` maps each public name to its submodule.
+_SRC = {
+    # misc.py
+    "TypeChangeWarning": ".misc",
+    "LowerTypeCastWarning": ".misc",
+    "filter_warnings": ".misc",
+    "ShapeError": ".misc",
+    # linop.py
+    "BaseLinearOperator": ".linop",
+    "LinearOperator": ".linop",
+    "IdentityOperator": ".linop",
+    "DiagonalOperator": ".linop",
+    "MatrixLinearOperator": ".linop",
+    "ZeroOperator": ".linop",
+    "InverseLO": ".linop",
+    "ReducedLinearOperator": ".linop",
+    "SymmetricallyReducedLinearOperator": ".linop",
+    "aslinearoperator": ".linop",
+    "null_log": ".linop",
+    # blkop.py
+    "BlockLinearOperator": ".blkop",
+    "BlockDiagonalLinearOperator": ".blkop",
+    "BlockPreconditioner": ".blkop",
+    "BlockDiagonalPreconditioner": ".blkop",
+    "BlockHorizontalLinearOperator": ".blkop",
+    "BlockVerticalLinearOperator": ".blkop",
+    # noise_ops.py
+    "NoiseCovLinearOperator": ".noise_ops",
+    "InvNoiseCovLinearOperator": ".noise_ops",
+    "BaseBlockDiagNoiseCovLinearOperator": ".noise_ops",
+    "BaseBlockDiagInvNoiseCovLinearOperator": ".noise_ops",
+}
 
-from .blkop import (
-    BlockLinearOperator,
-    BlockDiagonalLinearOperator,
-    BlockPreconditioner,
-    BlockDiagonalPreconditioner,
-    BlockHorizontalLinearOperator,
-    BlockVerticalLinearOperator,
-)
 
-from .noise_ops import (
-    NoiseCovLinearOperator,
-    InvNoiseCovLinearOperator,
-    BaseBlockDiagNoiseCovLinearOperator,
-    BaseBlockDiagInvNoiseCovLinearOperator,
-)
+# The submodules themselves are imported lazily as well
+_SUBMODULES = ("misc", "linop", "blkop", "noise_ops")
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _SRC:
+        value = getattr(importlib.import_module(_SRC[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = [
+    # Caching the object so that `__getattr__` is not called again for `name`
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SRC) | set(_SUBMODULES))
+
+
+# The imports are kept for the static analysis tools (type checkers and the
+# documentation generator)
+if TYPE_CHECKING:
+    from .misc import (
+        TypeChangeWarning,
+        LowerTypeCastWarning,
+        filter_warnings,
+        ShapeError,
+    )
+
+    from .linop import (
+        BaseLinearOperator,
+        LinearOperator,
+        IdentityOperator,
+        DiagonalOperator,
+        MatrixLinearOperator,
+        ZeroOperator,
+        InverseLO,
+        ReducedLinearOperator,
+        SymmetricallyReducedLinearOperator,
+        aslinearoperator,
+        null_log,
+    )
+
+    from .blkop import (
+        BlockLinearOperator,
+        BlockDiagonalLinearOperator,
+        BlockPreconditioner,
+        BlockDiagonalPreconditioner,
+        BlockHorizontalLinearOperator,
+        BlockVerticalLinearOperator,
+    )
+
+    from .noise_ops import (
+        NoiseCovLinearOperator,
+        InvNoiseCovLinearOperator,
+        BaseBlockDiagNoiseCovLinearOperator,
+        BaseBlockDiagInvNoiseCovLinearOperator,
+    )
+
+__all__ = (
     # misc.py
     "TypeChangeWarning",
     "LowerTypeCastWarning",
@@ -102,4 +169,4 @@ __all__ = [
     "InvNoiseCovLinearOperator",
     "BaseBlockDiagNoiseCovLinearOperator",
     "BaseBlockDiagInvNoiseCovLinearOperator",
-]
+)
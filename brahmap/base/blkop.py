@@ -68,7 +68,7 @@ class BlockLinearOperator(LinearOperator):
 
     Parameters
     ----------
-    blocks : List[LinearOperator]
+    blocks : List[List[LinearOperator]]
         _description_
     symmetric : bool, optional
         _description_, by default False
@@ -78,7 +78,7 @@ class BlockLinearOperator(LinearOperator):
 
     def __init__(
         self,
-        blocks: List[LinearOperator],
+        blocks: List[List[LinearOperator]],
         symmetric: bool = False,
         **kwargs: Any,
     ):
@@ -41,7 +41,7 @@
 # Licensed under the MIT License. See the <LICENSE.txt> file for details.
 
 
-from typing import Callable, Optional, Tuple, Any
+from typing import Callable, Optional, Tuple, Union, Any
 import numbers
 import numpy as np
 import numpy.typing as npt
@@ -56,6 +56,35 @@ null_log.setLevel(logging.WARNING)
 null_log.addHandler(logging.NullHandler())
 
 
+# The data-types resulting from the type promotion of pairs of data-types.
+# Only a handful of pairs show up in practice, so they are memoized in the
+# products with vectors instead of being computed by `np.result_type` every
+# time.
+_RESULT_TYPES = {}
+
+
+def _result_type(dtype1, dtype2):
+    key = (dtype1, dtype2)
+    result_type = _RESULT_TYPES.get(key)
+    if result_type is None:
+        result_type = _RESULT_TYPES[key] = np.result_type(dtype1, dtype2)
+    return result_type
+
+
+def _combine(ufunc, a, b, x):
+    # Computes `ufunc(a, b)`, where `a` and `b` are the products of two
+    # operators with `x`. The result is written in `a` to avoid allocating one
+    # more vector, unless `a` is a view of `x` or it would need an up-cast.
+    if (
+        isinstance(a, np.ndarray)
+        and a.flags.writeable
+        and a.dtype == np.result_type(a, b)
+        and not np.may_share_memory(a, x)
+    ):
+        return ufunc(a, b, out=a)
+    return ufunc(a, b)
+
+
 class BaseLinearOperator(object):
     """Base class for defining the common interface shared by all linear
     operators.
@@ -100,7 +129,8 @@ class BaseLinearOperator(object):
 
         # Log activity.
         self.logger = kwargs.get("logger", null_log)
-        self.logger.info("New linear operator with shape " + str(self.shape))
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("New linear operator with shape %s", self.shape)
         return
 
     @property
@@ -131,6 +161,9 @@ class BaseLinearOperator(object):
     @dtype.setter
     def dtype(self, dtype):
         self.__dtype = dtype
+        # The dtype object is cached for the quick comparisons in the
+        # products with vectors
+        self._dtype_obj = None if dtype is None else np.dtype(dtype)
 
     @property
     def nMatvec(self) -> int:
@@ -141,7 +174,7 @@ class BaseLinearOperator(object):
         """Reset operator/vector product counter to zero."""
         self._nMatvec = 0
 
-    def dot(self, x):
+    def dot(self, x: Any) -> Any:
         """Numpy-like dot() method."""
         return self.__mul__(x)
 
@@ -149,7 +182,7 @@ class BaseLinearOperator(object):
         # An alias for __mul__.
         return self.__mul__(*args, **kwargs)
 
-    def __mul__(self, x):
+    def __mul__(self, x: Any) -> Any:
         raise NotImplementedError("Please subclass to implement __mul__.")
 
     def __repr__(self) -> str:
@@ -196,32 +229,40 @@ class LinearOperator(BaseLinearOperator):
         rmatvec: Optional[Callable] = None,
         **kwargs,
     ):
+        # Subclasses whose `matvec` routine always returns a vector of size
+        # `nargout` can set it to `True` to skip the checks of the output
+        self._trust_inputs = False
+        # The operators whose product this operator is, if any
+        self._factors = None
+        # An optional routine `_matvec_out(x, out)` computing the product
+        # with `x` in the preallocated array `out`, and returning `out`
+        self._matvec_out = None
+
         super(LinearOperator, self).__init__(
             nargin,
             nargout,
             **kwargs,
         )
+        # The expected shapes of the input and output vectors, computed once
+        # for the checks in `matvec`
+        self.__in_shape = (int(nargin),)
+        self.__out_shape = (int(nargout),)
         adjoint_of = kwargs.get("adjoint_of", None) or kwargs.get("transpose_of", None)
         rmatvec = rmatvec or kwargs.get("matvec_transp", None)
 
         self.__matvec = matvec
+        self.__rmatvec = None
+        self.__kwargs = None
 
         if self.symmetric:
             self.__H = self
         else:
+            self.__H = None
             if adjoint_of is None:
                 if rmatvec is not None:
-                    # Create 'pointer' to transpose operator.
-                    self.__H = LinearOperator(
-                        nargout,
-                        nargin,
-                        matvec=rmatvec,
-                        rmatvec=matvec,
-                        adjoint_of=self,
-                        **kwargs,
-                    )
-                else:
-                    self.__H = None
+                    # The transpose operator is created on its first access
+                    self.__rmatvec = rmatvec
+                    self.__kwargs = kwargs
             else:
                 # Use operator supplied as transpose operator.
                 if isinstance(adjoint_of, BaseLinearOperator):
@@ -235,53 +276,106 @@ class LinearOperator(BaseLinearOperator):
                     raise ValueError(msg)
 
     @property
-    def T(self):
+    def T(self) -> Optional[BaseLinearOperator]:
         """The transpose operator"""
-        return self.__H
+        return self.H
 
     @property
-    def H(self):
+    def H(self) -> Optional[BaseLinearOperator]:
         """The adjoint operator"""
+        if self.__H is None and self.__rmatvec is not None:
+            # Create 'pointer' to transpose operator.
+            self.__H = LinearOperator(
+                self.nargout,
+                self.nargin,
+                matvec=self.__rmatvec,
+                rmatvec=self.__matvec,
+                adjoint_of=self,
+                **self.__kwargs,
+            )
         return self.__H
 
-    def matvec(self, x):
+    def matvec(self, x: npt.ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Matrix-vector multiplication.
 
         The matvec property encapsulates the `matvec` routine specified at
         construct time, to ensure the consistency of the input and output
         arrays with the operator's shape.
+
+        If `out` is given, the product is written in it and `out` is
+        returned. It must be an array of shape `(nargout,)`, to which the
+        data-type of the product can be cast with the `same_kind` rule. The
+        operators that know how to compute the product in place avoid
+        allocating a new array in this case.
         """
-        x = np.asanyarray(x)
-        M, N = self.shape
+        if (
+            out is None
+            and self._trust_inputs
+            and isinstance(x, np.ndarray)
+            and x.shape == self.__in_shape
+        ):
+            # The `matvec` routine is trusted to return an array of the
+            # right shape
+            return self.__matvec(x)
+
+        if not isinstance(x, np.ndarray):
+            x = np.asanyarray(x)
 
         # check input data consistency
-        N = int(N)
-        try:
+        if x.shape != self.__in_shape:
+            N = self.__in_shape[0]
+            if x.size != N:
+                msg = (
+                    "The size of the input array is incompatible with the "
+                    "operator dimensions\n"
+                    f"size of the input array: {x.size}\n"
+                    f"shape of the operator: {self.shape}"
+                )
+                raise ValueError(msg)
             x = x.reshape(N)
-        except ValueError:
-            msg = (
-                "The size of the input array is incompatible with the "
-                "operator dimensions\n"
-                f"size of the input array: {len(x)}\n"
-                f"shape of the operator: {self.shape}"
-            )
-            raise ValueError(msg)
+
+        if out is not None:
+            if out.shape != self.__out_shape:
+                msg = (
+                    "The shape of the output array is incompatible with the "
+                    "operator dimensions\n"
+                    f"shape of the output array: {out.shape}\n"
+                    f"shape of the operator: {self.shape}"
+                )
+                raise ValueError(msg)
+            # Same casting rule as the ufuncs, so that all the in-place routines
+            # accept the same output arrays
+            result_type = _result_type(self.dtype, x.dtype)
+            if not np.can_cast(result_type, out.dtype, casting="same_kind"):
+                msg = (
+                    "The data-type of the output array is incompatible with "
+                    "the product\n"
+                    f"data-type of the output array: {out.dtype}\n"
+                    f"data-type of the product: {result_type}"
+                )
+                raise TypeError(msg)
+            if self._matvec_out is not None:
+                return self._matvec_out(x, out)
 
         y = self.__matvec(x)
 
         # check output data consistency
-        M = int(M)
-        try:
-            y = y.reshape(M)
-        except ValueError:
-            msg = (
-                "The size of the output array is incompatible with the "
-                "operator dimensions\n"
-                f"size of the output array: {len(y)}\n"
-                f"shape of the operator: {self.shape}"
-            )
-            raise ValueError(msg)
+        if not (isinstance(y, np.ndarray) and y.shape == self.__out_shape):
+            try:
+                y = y.reshape(self.__out_shape)
+            except ValueError:
+                msg = (
+                    "The size of the output array is incompatible with the "
+                    "operator dimensions\n"
+                    f"size of the output array: {len(y)}\n"
+                    f"shape of the operator: {self.shape}"
+                )
+                raise ValueError(msg)
+
+        if out is not None:
+            out[...] = y
+            return out
 
         return y
 
@@ -294,14 +388,22 @@ class LinearOperator(BaseLinearOperator):
             and data-type `self.dtype`, and then fills them with numbers. As
             such it can occupy an enormous amount of memory. Don't use it
             unless you understand the risk!
+
+        The array is filled column by column, and it is therefore returned in
+        Fortran (column-major) order.
         """
         n, m = self.shape
-        H = np.empty((n, m), dtype=self.dtype)
+        H = np.empty((n, m), dtype=self.dtype, order="F")
         ej = np.zeros(m, dtype=self.dtype)
+
+        # Calling the `matvec` routine directly, bypassing the dispatch and
+        # the checks of `__mul__` for every column
+        matvec = self.__matvec
         for j in range(m):
             ej[j] = 1.0
-            H[:, j] = self * ej
+            H[:, j] = matvec(ej).reshape(n)
             ej[j] = 0.0
+        self._nMatvec += m
         return H
 
     def __mul_scalar(self, x):
@@ -337,15 +439,52 @@ class LinearOperator(BaseLinearOperator):
             )
             raise ShapeError(msg)
 
+        # The factors of products are kept in a flat tuple, so that a product
+        # of many operators is applied in a single loop instead of through
+        # nested closures
+        factors = (getattr(self, "_factors", None) or (self,)) + (
+            getattr(op, "_factors", None) or (op,)
+        )
+
+        def direct(factor):
+            # The products of the factors with vectors are computed directly
+            # by `__mul_vector`, skipping the dispatch of `__mul__`
+            if isinstance(factor, LinearOperator):
+                return factor.__mul_vector
+            return factor
+
+        # In the order of application
+        products = tuple(direct(factor) for factor in reversed(factors))
+        # Resolved on the first use, since the adjoints are created lazily
+        adjoint_products = None
+
         def matvec(x):
-            return self(op(x))
+            for mult in products:
+                x = mult(x)
+            return x
 
         def rmatvec(x):
-            return op.T(self.H(x))
+            nonlocal adjoint_products
+            if adjoint_products is None:
+                adjoint_products = tuple(direct(factor.H) for factor in factors)
+            for mult in adjoint_products:
+                x = mult(x)
+            return x
+
+        def matvec_out(x, out):
+            # Only the last factor to be applied writes in `out`
+            for mult in products[:-1]:
+                x = mult(x)
+            if isinstance(factors[0], LinearOperator):
+                # Counted as the products through `__mul_vector` are
+                factors[0]._nMatvec += 1
+                return factors[0].matvec(x, out=out)
+            out[...] = factors[0](x)
+            return out
 
         result_type = np.result_type(self.dtype, op.dtype)
 
-        return LinearOperator(
+        product = LinearOperator(
             op.nargin,
             self.nargout,
             symmetric=False,  # Generally.
@@ -353,17 +492,33 @@ class LinearOperator(BaseLinearOperator):
             rmatvec=rmatvec,
             dtype=result_type,
         )
+        product._factors = factors
+        product._matvec_out = matvec_out
+        return product
 
-    def __mul_vector(self, x):
+    def __mul_vector(self, x: np.ndarray) -> np.ndarray:
         # Product between a linear operator and a vector
         self._nMatvec += 1
-        result_type = np.result_type(self.dtype, x.dtype)
+        dtype = self._dtype_obj
+        if x.dtype == dtype:
+            # No type promotion is needed
+            y = self.matvec(x)
+            if y.dtype != dtype:
+                y = y.astype(dtype)
+            return y
+        result_type = _result_type(dtype, x.dtype)
         return self.matvec(x).astype(result_type, copy=False)
 
-    def __mul__(self, x):
+    def __mul__(
+        self, x: Union[numbers.Number, BaseLinearOperator, np.ndarray]
+    ) -> Union[BaseLinearOperator, np.ndarray]:
         # Returns a linear operator if x is a scalar or a linear operator
         # Returns a vector if x is an array
-        if isinstance(x, numbers.Number):
+        if type(x) is np.ndarray:
+            # The most frequent case is checked first, with a single identity
+            # comparison
+            return self.__mul_vector(x)
+        elif isinstance(x, numbers.Number):
             return self.__mul_scalar(x)
         elif isinstance(x, BaseLinearOperator):
             return self.__mul_linop(x)
@@ -389,10 +544,10 @@ class LinearOperator(BaseLinearOperator):
             raise ShapeError(msg)
 
         def matvec(x):
-            return self(x) + other(x)
+            return _combine(np.add, self(x), other(x), x)
 
         def rmatvec(x):
-            return self.H(x) + other.T(x)
+            return _combine(np.add, self.H(x), other.T(x), x)
 
         result_type = np.result_type(self.dtype, other.dtype)
 
@@ -420,10 +575,10 @@ class LinearOperator(BaseLinearOperator):
             raise ShapeError(msg)
 
         def matvec(x):
-            return self(x) - other(x)
+            return _combine(np.subtract, self(x), other(x), x)
 
         def rmatvec(x):
-            return self.H(x) - other.T(x)
+            return _combine(np.subtract, self.H(x), other.T(x), x)
 
         result_type = np.result_type(self.dtype, other.dtype)
 
@@ -453,7 +608,27 @@ class LinearOperator(BaseLinearOperator):
             return IdentityOperator(self.nargin)
         if other == 1:
             return self
-        return self * self ** (other - 1)
+
+        # Applying the operator `other` times in a loop, instead of composing
+        # `other` nested operators
+        def matvec(x):
+            for _ in range(other):
+                x = self(x)
+            return x
+
+        def rmatvec(x):
+            for _ in range(other):
+                x = self.H(x)
+            return x
+
+        return LinearOperator(
+            self.nargin,
+            self.nargout,
+            symmetric=self.symmetric,
+            matvec=matvec,
+            rmatvec=rmatvec,
+            dtype=self.dtype,
+        )
 
 
 class IdentityOperator(LinearOperator):
@@ -497,19 +672,29 @@ class DiagonalOperator(LinearOperator):
         if "dtype" in kwargs:
             kwargs.pop("dtype")
 
-        self.diag = np.asarray(diag)
-        if self.diag.ndim != 1:
+        # The dimension is checked first, as `np.ascontiguousarray()` would
+        # turn a scalar into an array of one element
+        if np.asarray(diag).ndim != 1:
             msg = "diag array must be 1-d"
             raise ValueError(msg)
+        # A strided view is copied once here, so that the products do not go
+        # through strided memory accesses
+        self.diag = np.ascontiguousarray(diag)
 
         super(DiagonalOperator, self).__init__(
             self.diag.shape[0],
             self.diag.shape[0],
             symmetric=True,
-            matvec=lambda x: self.diag * x,
+            matvec=self._mult,
             dtype=self.diag.dtype,
             **kwargs,
         )
+        self._matvec_out = self._mult
+
+    def _mult(self, x, out=None):
+        # A single pass over the memory. The output already has the promoted
+        # data-type, so that the cast in `__mul_vector` does not copy it again
+        return np.multiply(self.diag, x, out=out)
 
 
 class MatrixLinearOperator(LinearOperator):
@@ -519,17 +704,31 @@ class MatrixLinearOperator(LinearOperator):
     transpose (real) or conjugate transpose (complex). The operator's dtype
     is the same as the specified `matrix` argument.
 
+    The matrix is assumed to be non-symmetric, unless `symmetric=True` is
+    passed. With `check_symmetric=True`, the symmetry of a square matrix is
+    instead determined by comparing it with its conjugate transpose, which
+    costs $O(n^2)$ in time and memory.
+
     Parameters
     ----------
     matrix : np.ndarray
         _description_
+    symmetric : bool, optional
+        Whether the matrix is symmetric (hermitian), by default `False`
+    check_symmetric : bool, optional
+        Whether to determine the symmetry of the matrix from its elements,
+        overriding `symmetric`, by default `False`
     **kwargs: Any
         _description_
     """
 
-    def __init__(self, matrix: np.ndarray, **kwargs: Any):
-        if "symmetric" in kwargs:
-            kwargs.pop("symmetric")
+    def __init__(
+        self,
+        matrix: np.ndarray,
+        symmetric: bool = False,
+        check_symmetric: bool = False,
+        **kwargs: Any,
+    ):
         if "matvec" in kwargs:
             kwargs.pop("matvec")
         if "dtype" in kwargs:
@@ -542,13 +741,20 @@ class MatrixLinearOperator(LinearOperator):
             msg = "matrix must be 2-d (shape can be [M, N], [M, 1] or [1, N])"
             raise ValueError(msg)
 
+        self.__matrix = matrix
+
         matvec = matrix.dot
         iscomplex = np.iscomplexobj(matrix)
 
-        if matrix.shape[0] == matrix.shape[1]:
-            symmetric = np.all(matrix == matrix.conj().T)
-        else:
+        if matrix.shape[0] != matrix.shape[1]:
             symmetric = False
+        elif check_symmetric:
+            if hasattr(matrix, "toarray"):
+                # sparse matrix
+                symmetric = (matrix != matrix.conj().T).nnz == 0
+            else:
+                symmetric = np.array_equal(matrix, matrix.conj().T)
+        symmetric = bool(symmetric)
 
         if not symmetric:
             rmatvec = matrix.conj().T.dot if iscomplex else matrix.T.dot
@@ -564,6 +770,27 @@ class MatrixLinearOperator(LinearOperator):
             dtype=matrix.dtype,
             **kwargs,
         )
+        self._matvec_out = self._mult_out
+
+    def _mult_out(self, x, out):
+        matrix = self.__matrix
+        if (
+            type(matrix) is np.ndarray
+            and out.flags.c_contiguous
+            and out.dtype == np.result_type(matrix, x)
+            and not np.may_share_memory(out, x)
+        ):
+            # `np.dot` writes directly in `out` only under these conditions
+            return np.dot(matrix, x, out=out)
+        out[...] = matrix.dot(x)
+        return out
+
+    def to_array(self) -> np.ndarray:
+        """Returns a copy of the underlying matrix as a 2D NumPy array"""
+        if hasattr(self.__matrix, "toarray"):
+            # sparse matrix
+            return self.__matrix.toarray()
+        return np.array(self.__matrix, dtype=self.dtype)
 
 
 class ZeroOperator(LinearOperator):
@@ -585,23 +812,33 @@ class ZeroOperator(LinearOperator):
         if "rmatvec" in kwargs:
             kwargs.pop("rmatvec")
 
+        # The products are returned in the data type of the operator, so that
+        # they need no further cast. They are new arrays every time, as the
+        # callers may update them in place.
+        dtype = kwargs.get("dtype", np.float64)
+
         def matvec(x):
             if x.shape != (nargin,):
                 msg = "Input has shape " + str(x.shape)
                 msg += " instead of (%d,)" % self.nargin
                 raise ValueError(msg)
-            return np.zeros(nargout)
+            return np.zeros(nargout, dtype=dtype)
 
         def rmatvec(x):
             if x.shape != (nargout,):
                 msg = "Input has shape " + str(x.shape)
                 msg += " instead of (%d,)" % self.nargout
                 raise ValueError(msg)
-            return np.zeros(nargin)
+            return np.zeros(nargin, dtype=dtype)
+
+        def matvec_out(x, out):
+            out.fill(0)
+            return out
 
         super(ZeroOperator, self).__init__(
             nargin, nargout, matvec=matvec, rmatvec=rmatvec, **kwargs
         )
+        self._matvec_out = matvec_out
 
 
 class InverseLO(LinearOperator):
@@ -623,6 +860,8 @@ class InverseLO(LinearOperator):
         super(InverseLO, self).__init__(
             nargin=A.shape[0], nargout=A.shape[1], matvec=self.mult, symmetric=True
         )
+        # The solver returns a solution of the shape of `x`
+        self._trust_inputs = True
         self.A = A
         self.__method = method
         self.__preconditioner = preconditioner
@@ -685,6 +924,18 @@ class InverseLO(LinearOperator):
         return self.__preconditioner
 
 
+def _reduced_mult(op, z, in_indices, out_indices, x):
+    # Computes `(op * z)[out_indices]`, where `z` is zero everywhere except at
+    # `in_indices`, where it takes the values of `x`. The buffer `z` is reused
+    # if it has the data-type of `x`, and it is reset to zero afterwards.
+    if x.dtype != z.dtype:
+        z = np.zeros(z.shape[0], dtype=x.dtype)
+    np.put(z, in_indices, x)
+    y = np.take(op * z, out_indices)
+    np.put(z, in_indices, 0)
+    return y
+
+
 def ReducedLinearOperator(op, row_indices, col_indices):
     """
     Implements reduction of a linear operator (non symmetrical).
@@ -697,17 +948,18 @@ def ReducedLinearOperator(op, row_indices, col_indices):
     nargin, nargout = len(col_indices), len(row_indices)
     m, n = op.shape  # Shape of non-reduced operator.
 
+    row_indices = np.ascontiguousarray(row_indices, dtype=np.intp)
+    col_indices = np.ascontiguousarray(col_indices, dtype=np.intp)
+
+    # Zero-filled buffers reused by the products
+    zn = np.zeros(n, dtype=op.dtype)
+    zm = np.zeros(m, dtype=op.dtype)
+
     def matvec(x):
-        z = np.zeros(n, dtype=x.dtype)
-        z[col_indices] = x[:]
-        y = op * z
-        return y[row_indices]
+        return _reduced_mult(op, zn, col_indices, row_indices, x)
 
     def rmatvec(x):
-        z = np.zeros(m, dtype=x.dtype)
-        z[row_indices] = x[:]
-        y = op.H * z
-        return y[col_indices]
+        return _reduced_mult(op.H, zm, row_indices, col_indices, x)
 
     return LinearOperator(
         nargin, nargout, matvec=matvec, symmetric=False, rmatvec=rmatvec
@@ -726,17 +978,17 @@ def SymmetricallyReducedLinearOperator(op, indices):
     nargin = len(indices)
     m, n = op.shape  # Shape of non-reduced operator.
 
+    indices = np.ascontiguousarray(indices, dtype=np.intp)
+
+    # Zero-filled buffers reused by the products
+    zn = np.zeros(n, dtype=op.dtype)
+    zm = np.zeros(m, dtype=op.dtype)
+
     def matvec(x):
-        z = np.zeros(n, dtype=x.dtype)
-        z[indices] = x[:]
-        y = op * z
-        return y[indices]
+        return _reduced_mult(op, zn, indices, indices, x)
 
     def rmatvec(x):
-        z = np.zeros(m, dtype=x.dtype)
-        z[indices] = x[:]
-        y = op * z
-        return y[indices]
+        return _reduced_mult(op, zm, indices, indices, x)
 
     return LinearOperator(
         nargin, nargin, matvec=matvec, symmetric=op.symmetric, rmatvec=rmatvec
@@ -17,13 +17,15 @@ from .unary_functions import (
 
 from .linalg_tools import multiply_array
 
-from .linalg import parallel_norm, cg
-
+# The dtype aliases must be defined before importing `.linalg`, since it
+# imports `brahmap.base`, which in turn depends on them
 DTypeFloat = _typing._DTypeLikeFloat
 DTypeInt = _typing._DTypeLikeInt
 DTypeUInit = _typing._DTypeLikeUInt
 DTypeBool = _typing._DTypeLikeBool
 
+from .linalg import parallel_norm, cg  # noqa: E402
+
 __all__ = [
     "sin",
     "cos",
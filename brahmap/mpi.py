@@ -1,4 +1,6 @@
 import os
+import atexit
+from typing import Type
 
 from mpi4py import MPI
 from mpi4py.MPI import Intracomm
@@ -12,26 +14,42 @@ class _MPI(object):
         comm: Intracomm,
         raise_exception_per_process: bool,
     ) -> None:
-        self.update_communicator(comm=comm)
+        # The size and rank are read only on first use, as MPI may not be
+        # initialized yet
+        self.__comm = comm
+        self.__size = None
+        self.__rank = None
         self.raise_exception_per_process = raise_exception_per_process
 
     def update_communicator(self, comm: Intracomm) -> None:
+        _initialize_MPI()
         self.__comm = comm
         self.__size = comm.size
         self.__rank = comm.rank
 
     @property
     def comm(self):
+        if self.__size is None:
+            self.update_communicator(comm=self.__comm)
         return self.__comm
 
     @property
     def size(self):
+        if self.__size is None:
+            self.update_communicator(comm=self.__comm)
         return self.__size
 
     @property
     def rank(self):
+        if self.__size is None:
+            self.update_communicator(comm=self.__comm)
         return self.__rank
 
+    @property
+    def thread_level(self):
+        _initialize_MPI()
+        return _MPI_THREAD_LEVEL
+
     @property
     def nthreads_per_process(self):
         if "OMP_NUM_THREADS" in os.environ:
@@ -43,9 +61,64 @@ class _MPI(object):
 
 MPI_UTILS: _MPI = _MPI(comm=MPI.COMM_WORLD, raise_exception_per_process=True)
 
+_finalize_registered = False
+
+# Level of thread support provided by the MPI library
+_MPI_THREAD_LEVEL = None
+
+
+def _initialize_MPI() -> None:
+    """Initializes MPI if it is not already initialized, and registers
+    `Finalize` with `atexit` on its first call."""
+    global _finalize_registered, _MPI_THREAD_LEVEL
+
+    if MPI.Is_initialized() is False:
+        _MPI_THREAD_LEVEL = MPI.Init_thread(required=MPI.THREAD_FUNNELED)
+    elif _MPI_THREAD_LEVEL is None:
+        # MPI has been initialized by someone else, possibly with a different
+        # level of thread support
+        _MPI_THREAD_LEVEL = MPI.Query_thread()
+
+    if not _finalize_registered:
+        atexit.register(Finalize)
+        _finalize_registered = True
+
+
+def _set_default_num_threads() -> None:
+    """Sets the default number of threads used by the OpenMP and BLAS
+    libraries, such that the MPI processes running on the same node share the
+    cores they are bound to, instead of each of them using all of these cores.
+    It has an effect on the BLAS libraries only if it is called before
+    importing NumPy. The values already set in the environment are left
+    untouched."""
+    # The cores this process is allowed to run on. Unlike `os.cpu_count()`,
+    # it accounts for the binding done by the launcher (e.g. Slurm)
+    if hasattr(os, "sched_getaffinity"):
+        cpus = set(os.sched_getaffinity(0))
+    else:
+        cpus = set(range(os.cpu_count() or 1))
+
+    # The cores are divided among the processes of the node bound to them
+    node_comm = MPI.COMM_WORLD.Split_type(MPI.COMM_TYPE_SHARED)
+    nsharing = sum(1 for other_cpus in node_comm.allgather(cpus) if cpus & other_cpus)
+    node_comm.Free()
+    nthreads = max(1, len(cpus) // nsharing)
+
+    for variable in (
+        "OMP_NUM_THREADS",
+        "OPENBLAS_NUM_THREADS",
+        "MKL_NUM_THREADS",
+        "BLIS_NUM_THREADS",
+        "VECLIB_MAXIMUM_THREADS",
+    ):
+        os.environ.setdefault(variable, str(nthreads))
+
 
 def Finalize() -> None:
-    """A function to be called at the end of execution. Once registered with `atexit`, it will be called automatically at the end. The user doesn't need to call this function explicitly."""
+    """A function to be called at the end of execution. Once registered with `atexit`, it will be called automatically at the end. The user doesn't need to call this function explicitly. It does nothing if MPI is not initialized or is already finalized."""
+    if MPI.Is_initialized() is False or MPI.Is_finalized() is True:
+        return
+
     try:
         MPI.Finalize()
     except Exception as e:
@@ -53,9 +126,28 @@ def Finalize() -> None:
             print(f"Caught an exception during MPI finalization: {e}")
 
 
+def shutdown() -> None:
+    """Finalizes MPI right away, instead of waiting for the end of execution.
+    It can be used to release the resources held by MPI in long running
+    processes, like Jupyter kernels, once they are done with `BrahMap`.
+
+    !!! Warning
+
+        MPI cannot be initialized again once it is finalized. Neither MPI nor
+        `BrahMap` can be used after calling this function.
+    """
+    global _finalize_registered
+
+    if _finalize_registered:
+        atexit.unregister(Finalize)
+        _finalize_registered = False
+
+    Finalize()
+
+
 def MPI_RAISE_EXCEPTION(
     condition: bool,
-    exception: Exception,
+    exception: Type[Exception],
     message: str,
 ):
     """Will raise `exception` with `message` if the `condition` is `True`.
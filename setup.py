@@ -1,7 +1,10 @@
 import os
 import subprocess
+import compileall
+import py_compile
 from setuptools import Extension, setup
 from setuptools.command.build_ext import build_ext
+from setuptools.command.build_py import build_py
 from setuptools._distutils.ccompiler import new_compiler
 import mpi4py
 import threading
@@ -215,6 +218,28 @@ class brahmap_build_ext(build_ext):
         super().build_extensions()
 
 
+#######################################################
+### defining the dedicated build for python modules ###
+#######################################################
+
+
+class brahmap_build_py(build_py):
+    def run(self) -> None:
+        super().run()
+
+        # Byte-compiling the package for all the optimization levels, so that
+        # the bytecode is shipped with the package instead of being generated
+        # by every process at its first import. The hash based validation of
+        # the bytecode keeps it valid even if the installation does not
+        # preserve the modification times of the source files.
+        compileall.compile_dir(
+            os.path.join(self.build_lib, "brahmap"),
+            optimize=[0, 1, 2],
+            quiet=1,
+            invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH,
+        )
+
+
 ext1 = Extension(
     "brahmap._extensions.compute_weights",
     sources=[os.path.join("brahmap", "_extensions", "compute_weights.cpp")],
@@ -286,6 +311,6 @@ update_git_hash()
 
 setup(
     ext_modules=[ext1, ext2, ext3, ext4, ext5, ext6],
-    cmdclass={"build_ext": brahmap_build_ext},
+    cmdclass={"build_ext": brahmap_build_ext, "build_py": brahmap_build_py},
     # include_package_data=True,
 )
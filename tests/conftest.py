@@ -14,6 +14,13 @@ def pytest_configure(config):
         "functions/classes that are to be excluded from the test count "
         "filtering",
     )
+    # Registered here so that the marker is known even when `pytest-xdist` is
+    # not installed
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): Marker for the tests that are to be run on the "
+        "same worker with `pytest-xdist --dist loadgroup`",
+    )
 
 
 def get_base_nodeid(nodeid):
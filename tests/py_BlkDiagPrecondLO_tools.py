@@ -16,19 +16,19 @@ def BDPLO_mult_QU(
     one_over_determinant: np.ndarray,
     vec: np.ndarray,
 ):
-    prod = np.zeros(new_npix * solver_type, dtype=vec.dtype)
+    # The components of `vec` and `prod` of each pixel, as the columns of
+    # `(new_npix, 2)` views. All the pixels are computed at once.
+    vec = vec.reshape(new_npix, solver_type)
+    prod = np.empty((new_npix, solver_type), dtype=vec.dtype)
 
-    for idx in range(new_npix):
-        prod[2 * idx] = (
-            weighted_sin_sq[idx] * vec[2 * idx]
-            - weighted_sincos[idx] * vec[2 * idx + 1]
-        ) * one_over_determinant[idx]
-        prod[2 * idx + 1] = (
-            -weighted_sincos[idx] * vec[2 * idx]
-            + weighted_cos_sq[idx] * vec[2 * idx + 1]
-        ) * one_over_determinant[idx]
+    prod[:, 0] = (
+        weighted_sin_sq * vec[:, 0] - weighted_sincos * vec[:, 1]
+    ) * one_over_determinant
+    prod[:, 1] = (
+        -weighted_sincos * vec[:, 0] + weighted_cos_sq * vec[:, 1]
+    ) * one_over_determinant
 
-    return prod
+    return prod.reshape(-1)
 
 
 def BDPLO_mult_IQU(
@@ -43,59 +43,26 @@ def BDPLO_mult_IQU(
     one_over_determinant: np.ndarray,
     vec: np.ndarray,
 ):
-    prod = np.zeros(new_npix * solver_type, dtype=vec.dtype)
+    # The components of `vec` and `prod` of each pixel, as the columns of
+    # `(new_npix, 3)` views. All the pixels are computed at once.
+    vec = vec.reshape(new_npix, solver_type)
+    prod = np.empty((new_npix, solver_type), dtype=vec.dtype)
 
-    for idx in range(new_npix):
-        prod[3 * idx] = (
-            (
-                weighted_cos_sq[idx] * weighted_sin_sq[idx]
-                - weighted_sincos[idx] * weighted_sincos[idx]
-            )
-            * vec[3 * idx]
-            + (
-                weighted_sin[idx] * weighted_sincos[idx]
-                - weighted_cos[idx] * weighted_sin_sq[idx]
-            )
-            * vec[3 * idx + 1]
-            + (
-                weighted_cos[idx] * weighted_sincos[idx]
-                - weighted_sin[idx] * weighted_cos_sq[idx]
-            )
-            * vec[3 * idx + 2]
-        ) * one_over_determinant[idx]
-        prod[3 * idx + 1] = (
-            (
-                weighted_sin[idx] * weighted_sincos[idx]
-                - weighted_cos[idx] * weighted_sin_sq[idx]
-            )
-            * vec[3 * idx]
-            + (
-                weighted_counts[idx] * weighted_sin_sq[idx]
-                - weighted_sin[idx] * weighted_sin[idx]
-            )
-            * vec[3 * idx + 1]
-            + (
-                weighted_sin[idx] * weighted_cos[idx]
-                - weighted_counts[idx] * weighted_sincos[idx]
-            )
-            * vec[3 * idx + 2]
-        ) * one_over_determinant[idx]
-        prod[3 * idx + 2] = (
-            (
-                weighted_cos[idx] * weighted_sincos[idx]
-                - weighted_sin[idx] * weighted_cos_sq[idx]
-            )
-            * vec[3 * idx]
-            + (
-                -weighted_counts[idx] * weighted_sincos[idx]
-                + weighted_cos[idx] * weighted_sin[idx]
-            )
-            * vec[3 * idx + 1]
-            + (
-                weighted_counts[idx] * weighted_cos_sq[idx]
-                - weighted_cos[idx] * weighted_cos[idx]
-            )
-            * vec[3 * idx + 2]
-        ) * one_over_determinant[idx]
+    prod[:, 0] = (
+        (weighted_cos_sq * weighted_sin_sq - weighted_sincos * weighted_sincos)
+        * vec[:, 0]
+        + (weighted_sin * weighted_sincos - weighted_cos * weighted_sin_sq) * vec[:, 1]
+        + (weighted_cos * weighted_sincos - weighted_sin * weighted_cos_sq) * vec[:, 2]
+    ) * one_over_determinant
+    prod[:, 1] = (
+        (weighted_sin * weighted_sincos - weighted_cos * weighted_sin_sq) * vec[:, 0]
+        + (weighted_counts * weighted_sin_sq - weighted_sin * weighted_sin) * vec[:, 1]
+        + (weighted_sin * weighted_cos - weighted_counts * weighted_sincos) * vec[:, 2]
+    ) * one_over_determinant
+    prod[:, 2] = (
+        (weighted_cos * weighted_sincos - weighted_sin * weighted_cos_sq) * vec[:, 0]
+        + (-weighted_counts * weighted_sincos + weighted_cos * weighted_sin) * vec[:, 1]
+        + (weighted_counts * weighted_cos_sq - weighted_cos * weighted_cos) * vec[:, 2]
+    ) * one_over_determinant
 
-    return prod
+    return prod.reshape(-1)
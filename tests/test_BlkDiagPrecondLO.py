@@ -3,13 +3,17 @@
 # Test defined here are related to the `BlockDiagonalPreconditionerLO` of BrahMap.
 # Analogous to this class, in the test suite, we have defined another version of `BlockDiagonalPreconditionerLO` based on only the python routines.
 #
-# - class `TestBlkDiagPrecondLO_I_Cpp`:
+# - class `TestBlkDiagPrecondLO_Cpp`:
 #
-#   -   `test_I_cpp`: tests whether `mult` and `rmult` method overloads of
-# the two versions of `BlkDiagPrecondLO_tools.BDPLO_mult_I()` produce the
-# same result
+#   -   `test_cpp`: tests whether `mult` and `rmult` method overloads of
+# the two versions of `BlockDiagonalPreconditionerLO` produce the same
+# result, for the solver types I, QU and IQU
 #
-# - Same as above, but for QU and IQU
+# - class `TestBlkDiagPrecondLO_IntDtype`:
+#
+#   -   `test_int_dtype`: same as `test_cpp`, but for the `int32` pointings.
+# The other tests use only the `int64` pointings, as the pointings of the two
+# integer types are the same
 #
 # - class `TestBlkDiagPrecondLO_I`:
 #
@@ -23,17 +27,29 @@
 #
 ###########################################################################
 
+import functools
+
 import pytest
 import numpy as np
 
 import brahmap
 
-import py_BlkDiagPrecondLO as bdplo
-import py_ProcessTimeSamples as hpts
+# `brahmap.core.BlockDiagonalPreconditionerLO` has no fallback on the Python
+# routines, so there is nothing to test without its C++ extension
+pytest.importorskip(
+    modname="brahmap._extensions.BlkDiagPrecondLO_tools",
+    reason="Couldn't import the C++ extension of `BlockDiagonalPreconditionerLO`",
+)
+
+import py_BlkDiagPrecondLO as bdplo  # noqa: E402
+import py_ProcessTimeSamples as hpts  # noqa: E402
+
+
+# A single random number generator for all the data of this file
+rng = np.random.default_rng(6534 + brahmap.MPI_UTILS.rank)
 
 
 class InitCommonParams:
-    np.random.seed(6534 + brahmap.MPI_UTILS.rank)
     npix = 128
     nsamples_global = npix * 6
 
@@ -45,18 +61,24 @@ class InitCommonParams:
     nbad_pixels = div + (brahmap.MPI_UTILS.rank < rem)
 
     pointings_flag = np.ones(nsamples, dtype=bool)
-    bad_samples = np.random.randint(low=0, high=nsamples, size=nbad_pixels)
+    bad_samples = rng.integers(low=0, high=nsamples, size=nbad_pixels)
     pointings_flag[bad_samples] = False
 
 
+def _make_pointings(rng, npix, nsamples):
+    return rng.integers(low=0, high=npix, size=nsamples, dtype=np.int64)
+
+
+# The pointings are drawn only once, and shared by all the integer types
+pointings = _make_pointings(rng, InitCommonParams.npix, InitCommonParams.nsamples)
+
+
 class InitInt32Params(InitCommonParams):
     def __init__(self) -> None:
         super().__init__()
 
         self.dtype = np.int32
-        self.pointings = np.random.randint(
-            low=0, high=self.npix, size=self.nsamples, dtype=self.dtype
-        )
+        self.pointings = pointings.astype(self.dtype)
 
 
 class InitInt64Params(InitCommonParams):
@@ -64,9 +86,7 @@ class InitInt64Params(InitCommonParams):
         super().__init__()
 
         self.dtype = np.int64
-        self.pointings = np.random.randint(
-            low=0, high=self.npix, size=self.nsamples, dtype=self.dtype
-        )
+        self.pointings = pointings
 
 
 class InitFloat32Params(InitCommonParams):
@@ -74,12 +94,10 @@ class InitFloat32Params(InitCommonParams):
         super().__init__()
 
         self.dtype = np.float32
-        self.noise_weights = np.random.random(size=self.nsamples).astype(
-            dtype=self.dtype
-        )
-        self.pol_angles = np.random.uniform(
-            low=-np.pi / 2.0, high=np.pi / 2.0, size=self.nsamples
-        ).astype(dtype=self.dtype)
+        self.noise_weights = rng.random(size=self.nsamples, dtype=self.dtype)
+        self.pol_angles = (
+            rng.random(size=self.nsamples, dtype=self.dtype) - 0.5
+        ) * np.pi
 
 
 class InitFloat64Params(InitCommonParams):
@@ -87,12 +105,10 @@ class InitFloat64Params(InitCommonParams):
         super().__init__()
 
         self.dtype = np.float64
-        self.noise_weights = np.random.random(size=self.nsamples).astype(
-            dtype=self.dtype
-        )
-        self.pol_angles = np.random.uniform(
-            low=-np.pi / 2.0, high=np.pi / 2.0, size=self.nsamples
-        ).astype(dtype=self.dtype)
+        self.noise_weights = rng.random(size=self.nsamples, dtype=self.dtype)
+        self.pol_angles = (
+            rng.random(size=self.nsamples, dtype=self.dtype) - 0.5
+        ) * np.pi
 
 
 # Initializing the parameter classes
@@ -101,264 +117,266 @@ initint64 = InitInt64Params()
 initfloat32 = InitFloat32Params()
 initfloat64 = InitFloat64Params()
 
+initint_params = {"int32": initint32, "int64": initint64}
+initfloat_params = {"float32": initfloat32, "float64": initfloat64}
+
+
+# The `ProcessTimeSamples` object and the objects derived from it depend only
+# on `(solver_type, initint, initfloat)`. They are therefore built once per
+# parameter set by the memoized builders below, instead of being rebuilt by
+# every test. The cache key of all of them is the tuple
+# `pts_key = (solver_type, int_label, float_label)`, with which the fixture
+# `pts_key` is to be parametrized indirectly.
+@functools.lru_cache(maxsize=None)
+def _build_pts(solver_type, int_label, float_label):
+    initint = initint_params[int_label]
+    initfloat = initfloat_params[float_label]
+
+    return hpts.ProcessTimeSamples(
+        npix=InitCommonParams.npix,
+        pointings=initint.pointings,
+        pointings_flag=InitCommonParams.pointings_flag,
+        solver_type=solver_type,
+        pol_angles=None if solver_type == hpts.SolverType.I else initfloat.pol_angles,
+        noise_weights=initfloat.noise_weights,
+        dtype_float=initfloat.dtype,
+        update_pointings_inplace=False,
+    )
 
-@pytest.mark.parametrize(
-    "initint, initfloat, rtol, atol",
-    [
-        (initint32, initfloat32, 1.5e-4, 1.0e-5),
-        (initint64, initfloat32, 1.5e-4, 1.0e-5),
-        (initint32, initfloat64, 1.5e-5, 1.0e-10),
-        (initint64, initfloat64, 1.5e-5, 1.0e-10),
-    ],
-)
-class TestBlkDiagPrecondLO_I_Cpp(InitCommonParams):
-    def test_I_cpp(self, initint, initfloat, rtol, atol):
-        solver_type = hpts.SolverType.I
 
-        PTS = hpts.ProcessTimeSamples(
-            npix=self.npix,
-            pointings=initint.pointings,
-            pointings_flag=self.pointings_flag,
-            solver_type=solver_type,
-            noise_weights=initfloat.noise_weights,
-            dtype_float=initfloat.dtype,
-            update_pointings_inplace=False,
-        )
-        BDP_cpp = brahmap.core.BlockDiagonalPreconditionerLO(PTS)
-        BDP_py = bdplo.BlockDiagonalPreconditionerLO(PTS)
+@functools.lru_cache(maxsize=None)
+def _build_bdp_cpp(*pts_key):
+    return brahmap.core.BlockDiagonalPreconditionerLO(_build_pts(*pts_key))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_bdp_py(*pts_key):
+    return bdplo.BlockDiagonalPreconditionerLO(_build_pts(*pts_key))
+
+
+@functools.lru_cache(maxsize=None)
+def _build_bdp_array(*pts_key):
+    return _build_bdp_cpp(*pts_key).to_array()
+
+
+@functools.lru_cache(maxsize=None)
+def _build_vec(*pts_key):
+    # A random vector that the operators built from `pts_key` can be applied to
+    pts = _build_pts(*pts_key)
+    return rng.random(size=pts.new_npix * pts.solver_type, dtype=pts.dtype_float)
+
+
+def _pts_param(pts_key, *values):
+    """Returns the parameter set `(pts_key, *values)` for the tests using the
+    fixture `pts_key`. With `pytest-xdist`, the tests sharing a `pts_key` are
+    placed in the same group, so that `--dist loadgroup` runs them on the same
+    worker and the cached objects are built only once."""
+    solver_type, int_label, float_label = pts_key
+    return pytest.param(
+        pts_key,
+        *values,
+        marks=pytest.mark.xdist_group(f"{solver_type.name}_{int_label}_{float_label}"),
+    )
+
 
-        vec = np.random.random(PTS.new_npix * PTS.solver_type).astype(
-            dtype=initfloat.dtype, copy=False
-        )
+@pytest.fixture
+def pts_key(request):
+    return request.param
 
-        cpp_prod = BDP_cpp * vec
 
-        py_prod = BDP_py * vec
+@pytest.fixture
+def pts(pts_key):
+    return _build_pts(*pts_key)
 
-        np.testing.assert_allclose(cpp_prod, py_prod, rtol=rtol, atol=atol)
 
+@pytest.fixture
+def bdp_cpp(pts_key):
+    return _build_bdp_cpp(*pts_key)
 
+
+@pytest.fixture
+def bdp_py(pts_key):
+    return _build_bdp_py(*pts_key)
+
+
+@pytest.fixture
+def bdp_array(pts_key):
+    return _build_bdp_array(*pts_key)
+
+
+@pytest.fixture
+def vec(pts_key):
+    return _build_vec(*pts_key)
+
+
+# All the parameters of this class are required to pass, as it was the case
+# for the three classes for I, QU and IQU that it replaces. Otherwise, the
+# parameter count filtering of `conftest.py` would tolerate half of the 6
+# parameters failing, possibly all those of a solver type.
+#
+# The pointings of both the integer types are the same, so this class and the
+# `to_array` ones below use only the `int64` pointings. The `int32` pointings
+# are covered by `TestBlkDiagPrecondLO_IntDtype`.
+@pytest.mark.ignore_param_count
 @pytest.mark.parametrize(
-    "initint, initfloat, rtol, atol",
+    "pts_key, rtol, atol",
     [
-        (initint32, initfloat32, 1.5e-4, 1.0e-5),
-        (initint64, initfloat32, 1.5e-4, 1.0e-5),
-        (initint32, initfloat64, 1.5e-5, 1.0e-10),
-        (initint64, initfloat64, 1.5e-5, 1.0e-10),
+        _pts_param((solver_type, "int64", float_label), rtol, atol)
+        for solver_type in hpts.SolverType
+        for float_label, rtol, atol in [
+            ("float32", 1.5e-4, 1.0e-5),
+            ("float64", 1.5e-5, 1.0e-10),
+        ]
     ],
+    indirect=["pts_key"],
 )
-class TestBlkDiagPrecondLO_QU_Cpp(InitCommonParams):
-    def test_QU_cpp(self, initint, initfloat, rtol, atol):
-        solver_type = hpts.SolverType.QU
-
-        PTS = hpts.ProcessTimeSamples(
-            npix=self.npix,
-            pointings=initint.pointings,
-            pointings_flag=self.pointings_flag,
-            solver_type=solver_type,
-            pol_angles=initfloat.pol_angles,
-            noise_weights=initfloat.noise_weights,
-            dtype_float=initfloat.dtype,
-            update_pointings_inplace=False,
-        )
-        BDP_cpp = brahmap.core.BlockDiagonalPreconditionerLO(PTS)
-        BDP_py = bdplo.BlockDiagonalPreconditionerLO(PTS)
+class TestBlkDiagPrecondLO_Cpp(InitCommonParams):
+    def test_cpp(self, bdp_cpp, bdp_py, vec, rtol, atol):
+        cpp_prod = bdp_cpp * vec
 
-        vec = np.random.random(PTS.new_npix * PTS.solver_type).astype(
-            dtype=initfloat.dtype, copy=False
-        )
+        py_prod = bdp_py * vec
 
-        cpp_prod = BDP_cpp * vec
-
-        py_prod = BDP_py * vec
-
-        np.testing.assert_allclose(cpp_prod, py_prod, rtol=rtol, atol=atol)
+        assert_allclose(cpp_prod, py_prod, rtol=rtol, atol=atol)
 
 
+# The `int64` pointings are already covered by `TestBlkDiagPrecondLO_Cpp`.
+# Without the marker, the parameter count filtering of `conftest.py` would let
+# the single parameter of this class fail.
+@pytest.mark.ignore_param_count
 @pytest.mark.parametrize(
-    "initint, initfloat, rtol, atol",
+    "pts_key, rtol, atol",
     [
-        (initint32, initfloat32, 1.5e-4, 1.0e-5),
-        (initint64, initfloat32, 1.5e-4, 1.0e-5),
-        (initint32, initfloat64, 1.5e-5, 1.0e-10),
-        (initint64, initfloat64, 1.5e-5, 1.0e-10),
+        _pts_param((hpts.SolverType.IQU, "int32", "float64"), 1.5e-5, 1.0e-10),
     ],
+    indirect=["pts_key"],
 )
-class TestBlkDiagPrecondLO_IQU_Cpp(InitCommonParams):
-    def test_IQU_cpp(self, initint, initfloat, rtol, atol):
-        solver_type = hpts.SolverType.IQU
+class TestBlkDiagPrecondLO_IntDtype(InitCommonParams):
+    def test_int_dtype(self, bdp_cpp, bdp_py, vec, rtol, atol):
+        cpp_prod = bdp_cpp * vec
+
+        py_prod = bdp_py * vec
 
-        PTS = hpts.ProcessTimeSamples(
-            npix=self.npix,
-            pointings=initint.pointings,
-            pointings_flag=self.pointings_flag,
-            solver_type=solver_type,
-            pol_angles=initfloat.pol_angles,
-            noise_weights=initfloat.noise_weights,
-            dtype_float=initfloat.dtype,
-            update_pointings_inplace=False,
-        )
-        BDP_cpp = brahmap.core.BlockDiagonalPreconditionerLO(PTS)
-        BDP_py = bdplo.BlockDiagonalPreconditionerLO(PTS)
+        assert_allclose(cpp_prod, py_prod, rtol=rtol, atol=atol)
 
-        vec = np.random.random(PTS.new_npix * PTS.solver_type).astype(
-            dtype=initfloat.dtype, copy=False
-        )
 
-        cpp_prod = BDP_cpp * vec
+def assert_allclose(actual, desired, rtol, atol):
+    """Same check as `np.testing.assert_allclose()`, element by element, but
+    without its masking and formatting overhead when the arrays match. The
+    latter is called only to report the mismatches."""
+    actual = np.asarray(actual)
+    desired = np.asarray(desired)
+    if actual.shape == desired.shape and np.all(
+        np.abs(actual - desired) <= atol + rtol * np.abs(desired)
+    ):
+        return
+    np.testing.assert_allclose(actual, desired, rtol=rtol, atol=atol)
 
-        py_prod = BDP_py * vec
 
-        np.testing.assert_allclose(cpp_prod, py_prod, rtol=rtol, atol=atol)
+def block_diag_dense(blocks):
+    """Returns the dense block diagonal matrix made of the `k x k` blocks of
+    the array `blocks` of shape `(nblocks, k, k)`"""
+    nblocks, k, _ = blocks.shape
+    matrix = np.zeros((nblocks, k, nblocks, k), dtype=blocks.dtype)
+    # With a repeated index, `einsum` returns a writeable view of the
+    # diagonal blocks of `matrix`
+    np.einsum("pipj->pij", matrix)[...] = blocks
+    return matrix.reshape(nblocks * k, nblocks * k)
 
 
 @pytest.mark.parametrize(
-    "initint, initfloat, rtol, atol",
+    "pts_key, rtol, atol",
     [
-        (initint32, initfloat32, 1.5e-4, 1.0e-5),
-        (initint64, initfloat32, 1.5e-4, 1.0e-5),
-        (initint32, initfloat64, 1.5e-5, 1.0e-10),
-        (initint64, initfloat64, 1.5e-5, 1.0e-10),
+        _pts_param((hpts.SolverType.I, "int64", "float32"), 1.5e-4, 1.0e-5),
+        _pts_param((hpts.SolverType.I, "int64", "float64"), 1.5e-5, 1.0e-10),
     ],
+    indirect=["pts_key"],
 )
 class TestBlkDiagPrecondLO_I(InitCommonParams):
-    def test_I(self, initint, initfloat, rtol, atol):
-        solver_type = hpts.SolverType.I
+    def test_I(self, pts, bdp_array, rtol, atol):
+        diag_inv_count = np.diag(1.0 / pts.weighted_counts)
 
-        PTS = hpts.ProcessTimeSamples(
-            npix=self.npix,
-            pointings=initint.pointings,
-            pointings_flag=self.pointings_flag,
-            solver_type=solver_type,
-            noise_weights=initfloat.noise_weights,
-            dtype_float=initfloat.dtype,
-            update_pointings_inplace=False,
-        )
-        BDP = brahmap.core.BlockDiagonalPreconditionerLO(PTS)
-
-        bdp_array = BDP.to_array()
-        diag_inv_count = np.diag(1.0 / PTS.weighted_counts)
-
-        np.testing.assert_allclose(bdp_array, diag_inv_count, rtol=rtol, atol=atol)
+        assert_allclose(bdp_array, diag_inv_count, rtol=rtol, atol=atol)
 
 
 @pytest.mark.parametrize(
-    "initint, initfloat, rtol, atol",
+    "pts_key, rtol, atol",
     [
-        (initint32, initfloat32, 1.5e-3, 1.0e-5),
-        (initint64, initfloat32, 1.5e-3, 1.0e-5),
-        (initint32, initfloat64, 1.5e-5, 1.0e-10),
-        (initint64, initfloat64, 1.5e-5, 1.0e-10),
+        _pts_param((hpts.SolverType.QU, "int64", "float32"), 1.5e-3, 1.0e-5),
+        _pts_param((hpts.SolverType.QU, "int64", "float64"), 1.5e-5, 1.0e-10),
     ],
+    indirect=["pts_key"],
 )
 class TestBlkDiagPrecondLO_QU(InitCommonParams):
-    def test_QU(self, initint, initfloat, rtol, atol):
-        solver_type = hpts.SolverType.QU
-
-        PTS = hpts.ProcessTimeSamples(
-            npix=self.npix,
-            pointings=initint.pointings,
-            pointings_flag=self.pointings_flag,
-            solver_type=solver_type,
-            pol_angles=initfloat.pol_angles,
-            noise_weights=initfloat.noise_weights,
-            dtype_float=initfloat.dtype,
-            update_pointings_inplace=False,
-        )
-        BDP = brahmap.core.BlockDiagonalPreconditionerLO(PTS)
-
-        bdp_matrix = BDP.to_array()
-
-        bdp_test_matrix = np.zeros(
-            (PTS.new_npix * PTS.solver_type, PTS.new_npix * PTS.solver_type),
-            dtype=initfloat.dtype,
-        )
-
-        for idx in range(PTS.new_npix):
-            block_matrix = np.zeros((2, 2), dtype=initfloat.dtype)
-            block_matrix[0, 0] = PTS.weighted_cos_sq[idx]
-            block_matrix[0, 1] = PTS.weighted_sincos[idx]
-            block_matrix[1, 0] = PTS.weighted_sincos[idx]
-            block_matrix[1, 1] = PTS.weighted_sin_sq[idx]
-            block_inv = np.linalg.inv(block_matrix)
-
-            bdp_test_matrix[
-                idx * 2 : (idx + 1) * 2, idx * 2 : (idx + 1) * 2
-            ] = block_inv
-
-        np.testing.assert_allclose(bdp_matrix, bdp_test_matrix, rtol=rtol, atol=atol)
+    def test_QU(self, pts, bdp_array, rtol, atol):
+        # The inverse of the 2x2 block [[cs, sc], [sc, ss]] of each pixel, in
+        # closed form
+        cs = pts.weighted_cos_sq
+        sc = pts.weighted_sincos
+        ss = pts.weighted_sin_sq
+        det = cs * ss - sc * sc
+
+        block_inv = np.empty((pts.new_npix, 2, 2), dtype=pts.dtype_float)
+        np.divide(ss, det, out=block_inv[:, 0, 0])
+        np.divide(-sc, det, out=block_inv[:, 0, 1])
+        block_inv[:, 1, 0] = block_inv[:, 0, 1]
+        np.divide(cs, det, out=block_inv[:, 1, 1])
+
+        bdp_test_matrix = block_diag_dense(block_inv)
+
+        assert_allclose(bdp_array, bdp_test_matrix, rtol=rtol, atol=atol)
 
 
 @pytest.mark.parametrize(
-    "initint, initfloat, rtol, atol",
+    "pts_key, rtol, atol",
     [
-        (initint32, initfloat32, 1.0e-3, 1.0e-5),
-        (initint64, initfloat32, 1.0e-3, 1.0e-5),
-        (initint32, initfloat64, 1.5e-5, 1.0e-10),
-        (initint64, initfloat64, 1.5e-5, 1.0e-10),
+        _pts_param((hpts.SolverType.IQU, "int64", "float32"), 1.0e-3, 1.0e-5),
+        _pts_param((hpts.SolverType.IQU, "int64", "float64"), 1.5e-5, 1.0e-10),
     ],
+    indirect=["pts_key"],
 )
 class TestBlkDiagPrecondLO_IQU(InitCommonParams):
-    def test_IQU(self, initint, initfloat, rtol, atol):
-        solver_type = hpts.SolverType.IQU
-
-        PTS = hpts.ProcessTimeSamples(
-            npix=self.npix,
-            pointings=initint.pointings,
-            pointings_flag=self.pointings_flag,
-            solver_type=solver_type,
-            pol_angles=initfloat.pol_angles,
-            noise_weights=initfloat.noise_weights,
-            dtype_float=initfloat.dtype,
-            update_pointings_inplace=False,
-        )
-        BDP = brahmap.core.BlockDiagonalPreconditionerLO(PTS)
-
-        bdp_matrix = BDP.to_array()
-
-        bdp_test_matrix = np.zeros(
-            (PTS.new_npix * PTS.solver_type, PTS.new_npix * PTS.solver_type),
-            dtype=initfloat.dtype,
-        )
-
-        for idx in range(PTS.new_npix):
-            block_matrix = np.zeros((3, 3), dtype=initfloat.dtype)
-            block_matrix[0, 0] = PTS.weighted_counts[idx]
-            block_matrix[0, 1] = PTS.weighted_cos[idx]
-            block_matrix[0, 2] = PTS.weighted_sin[idx]
-            block_matrix[1, 0] = PTS.weighted_cos[idx]
-            block_matrix[1, 1] = PTS.weighted_cos_sq[idx]
-            block_matrix[1, 2] = PTS.weighted_sincos[idx]
-            block_matrix[2, 0] = PTS.weighted_sin[idx]
-            block_matrix[2, 1] = PTS.weighted_sincos[idx]
-            block_matrix[2, 2] = PTS.weighted_sin_sq[idx]
-            block_inv = np.linalg.inv(block_matrix)
-
-            bdp_test_matrix[
-                idx * 3 : (idx + 1) * 3, idx * 3 : (idx + 1) * 3
-            ] = block_inv
-
-        np.testing.assert_allclose(bdp_matrix, bdp_test_matrix, rtol=rtol, atol=atol)
+    def test_IQU(self, pts, bdp_array, rtol, atol):
+        # The inverse of the symmetric 3x3 block [[a, b, c], [b, d, e],
+        # [c, e, f]] of each pixel, as its adjugate divided by its determinant
+        a = pts.weighted_counts
+        b = pts.weighted_cos
+        c = pts.weighted_sin
+        d = pts.weighted_cos_sq
+        e = pts.weighted_sincos
+        f = pts.weighted_sin_sq
+
+        cofactors = np.empty((pts.new_npix, 3, 3), dtype=pts.dtype_float)
+        cofactors[:, 0, 0] = d * f - e * e
+        cofactors[:, 0, 1] = c * e - b * f
+        cofactors[:, 0, 2] = b * e - c * d
+        cofactors[:, 1, 1] = a * f - c * c
+        cofactors[:, 1, 2] = b * c - a * e
+        cofactors[:, 2, 2] = a * d - b * b
+        cofactors[:, 1, 0] = cofactors[:, 0, 1]
+        cofactors[:, 2, 0] = cofactors[:, 0, 2]
+        cofactors[:, 2, 1] = cofactors[:, 1, 2]
+
+        det = a * cofactors[:, 0, 0] + b * cofactors[:, 0, 1] + c * cofactors[:, 0, 2]
+        # In place, the cofactors are not needed anymore
+        block_inv = np.divide(cofactors, det[:, None, None], out=cofactors)
+
+        bdp_test_matrix = block_diag_dense(block_inv)
+
+        assert_allclose(bdp_array, bdp_test_matrix, rtol=rtol, atol=atol)
 
 
 if __name__ == "__main__":
     pytest.main(
         [
-            f"{__file__}::TestBlkDiagPrecondLO_I_Cpp::test_I_cpp",
-            "-v",
-            "-s",
-        ]
-    )
-    pytest.main(
-        [
-            f"{__file__}::TestBlkDiagPrecondLO_QU_Cpp::test_QU_cpp",
+            f"{__file__}::TestBlkDiagPrecondLO_Cpp::test_cpp",
             "-v",
             "-s",
         ]
     )
+
     pytest.main(
         [
-            f"{__file__}::TestBlkDiagPrecondLO_IQU_Cpp::test_IQU_cpp",
+            f"{__file__}::TestBlkDiagPrecondLO_IntDtype::test_int_dtype",
             "-v",
             "-s",
         ]
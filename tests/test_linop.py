@@ -0,0 +1,266 @@
+############################ TEST DESCRIPTION ############################
+#
+# Test defined here are related to the linear operators of `brahmap.base`.
+# Their products are compared with the products of the dense matrices they
+# represent.
+#
+# - class `TestMatvecOut`:
+#
+#   -   `test_out`: tests whether `matvec(x, out=out)` writes the product in
+# `out` and returns it, for the operators having their own in-place routine
+# as well as for a generic one
+#
+#   -   `test_out_fallback`: tests the dense `MatrixLinearOperator` with the
+# output arrays that `np.dot` cannot write in directly
+#
+#   -   `test_out_errors`: tests whether the output arrays of wrong shape or
+# data-type are rejected
+#
+#   -   `test_out_counters`: tests whether the products of the factors of a
+# composed operator are counted the same way with and without `out`
+#
+# - class `TestMatrixSymmetry`:
+#
+#   -   `test_symmetric_flags`: tests the symmetry of `MatrixLinearOperator`
+# given by `symmetric` and `check_symmetric`, for dense and sparse matrices
+#
+#   -   `test_adjoint`: tests the products of the adjoint of
+# `MatrixLinearOperator` with the conjugate transpose of the matrix
+#
+# - class `TestAdjointAndScaling`:
+#
+#   -   `test_lazy_adjoint`: tests the adjoint of `LinearOperator`, which is
+# created on the first access to `H` or `T`
+#
+#   -   `test_scaled_operators`: tests whether the products with the same
+# scalar are separate operators, with their own counters
+#
+#   -   `test_zero_scaling`: tests whether the products of the operators
+# scaled by zero are writeable arrays
+#
+###########################################################################
+
+import pytest
+import numpy as np
+import scipy.sparse
+
+import brahmap
+from brahmap.base import (
+    LinearOperator,
+    DiagonalOperator,
+    MatrixLinearOperator,
+    ZeroOperator,
+)
+
+rng = np.random.default_rng(2384 + brahmap.MPI_UTILS.rank)
+
+nrows = 7
+ncols = 5
+
+matrix = rng.random((nrows, ncols))
+diag = rng.random(ncols)
+
+
+# Each builder returns an operator along with its dense matrix
+operator_builders = {
+    "diagonal": lambda: (DiagonalOperator(diag), np.diag(diag)),
+    "dense": lambda: (MatrixLinearOperator(matrix), matrix),
+    "sparse": lambda: (
+        MatrixLinearOperator(scipy.sparse.csr_matrix(matrix)),
+        matrix,
+    ),
+    "zero": lambda: (ZeroOperator(ncols, nrows), np.zeros((nrows, ncols))),
+    "product": lambda: (
+        MatrixLinearOperator(matrix) * DiagonalOperator(diag),
+        matrix @ np.diag(diag),
+    ),
+    "generic": lambda: (
+        LinearOperator(ncols, nrows, matvec=matrix.dot, rmatvec=matrix.T.dot),
+        matrix,
+    ),
+}
+
+
+class TestMatvecOut:
+    @pytest.mark.parametrize("builder", operator_builders)
+    def test_out(self, builder):
+        operator, dense = operator_builders[builder]()
+        nargout, nargin = dense.shape
+
+        x = rng.random(nargin)
+        out = np.full(nargout, np.nan)
+
+        result = operator.matvec(x, out=out)
+
+        assert result is out
+        np.testing.assert_allclose(out, dense @ x, rtol=1.0e-12, atol=1.0e-14)
+
+    @pytest.mark.parametrize(
+        "output",
+        ["strided", "other_dtype", "aliasing_input"],
+    )
+    def test_out_fallback(self, output):
+        square_matrix = rng.random((ncols, ncols))
+        operator = MatrixLinearOperator(square_matrix)
+
+        x = rng.random(ncols)
+        expected = square_matrix @ x
+
+        if output == "strided":
+            buffer = np.zeros(2 * ncols)
+            out = buffer[::2]
+        elif output == "other_dtype":
+            out = np.zeros(ncols, dtype=np.float32)
+        else:
+            out = x
+
+        result = operator.matvec(x, out=out)
+
+        assert result is out
+        np.testing.assert_allclose(out, expected, rtol=1.0e-6, atol=1.0e-7)
+
+    @pytest.mark.parametrize("builder", operator_builders)
+    def test_out_errors(self, builder):
+        operator, dense = operator_builders[builder]()
+        nargout, nargin = dense.shape
+
+        x = rng.random(nargin)
+
+        with pytest.raises(ValueError):
+            operator.matvec(x, out=np.zeros(nargout + 1))
+
+        with pytest.raises(TypeError):
+            operator.matvec(x, out=np.zeros(nargout, dtype=np.int64))
+
+    def test_out_counters(self):
+        x = rng.random(ncols)
+
+        counts = []
+        for out in [None, np.zeros(nrows)]:
+            operator1 = MatrixLinearOperator(matrix)
+            operator2 = DiagonalOperator(diag)
+            product = operator1 * operator2
+
+            product.matvec(x, out=out)
+            counts.append((operator1.nMatvec, operator2.nMatvec))
+
+        assert counts[0] == counts[1] == (1, 1)
+
+
+square_matrix = rng.random((ncols, ncols)) + 1j * rng.random((ncols, ncols))
+hermitian_matrix = square_matrix + square_matrix.conj().T
+
+# The matrices, and the symmetry expected with `check_symmetric=True`
+symmetry_matrices = {
+    "hermitian": (hermitian_matrix, True),
+    "non_hermitian": (square_matrix, False),
+    "non_square": (matrix, False),
+}
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("name", symmetry_matrices)
+class TestMatrixSymmetry:
+    def test_symmetric_flags(self, name, sparse):
+        dense, is_symmetric = symmetry_matrices[name]
+        matrix = scipy.sparse.csr_matrix(dense) if sparse else dense
+        is_square = dense.shape[0] == dense.shape[1]
+
+        # No check of the elements by default
+        assert MatrixLinearOperator(matrix).symmetric is False
+        assert MatrixLinearOperator(matrix, symmetric=True).symmetric is is_square
+
+        for symmetric in [False, True]:
+            operator = MatrixLinearOperator(
+                matrix, symmetric=symmetric, check_symmetric=True
+            )
+            assert operator.symmetric is is_symmetric
+            if is_symmetric:
+                assert operator.H is operator
+
+    def test_adjoint(self, name, sparse):
+        dense, _ = symmetry_matrices[name]
+        matrix = scipy.sparse.csr_matrix(dense) if sparse else dense
+        operator = MatrixLinearOperator(matrix)
+
+        y = rng.random(dense.shape[0]) + 1j * rng.random(dense.shape[0])
+
+        np.testing.assert_allclose(
+            operator.H * y, dense.conj().T @ y, rtol=1.0e-12, atol=1.0e-14
+        )
+        np.testing.assert_allclose(
+            operator.H.to_array(), dense.conj().T, rtol=1.0e-12, atol=1.0e-14
+        )
+
+
+class TestAdjointAndScaling:
+    def test_lazy_adjoint(self):
+        operator = LinearOperator(ncols, nrows, matvec=matrix.dot, rmatvec=matrix.T.dot)
+
+        adjoint = operator.H
+        assert adjoint is operator.H
+        assert adjoint is operator.T
+        assert adjoint.H is operator
+        assert adjoint.shape == (ncols, nrows)
+
+        y = rng.random(nrows)
+        np.testing.assert_allclose(
+            adjoint * y, matrix.T @ y, rtol=1.0e-12, atol=1.0e-14
+        )
+
+        # Without `rmatvec`, there is no adjoint
+        assert LinearOperator(ncols, nrows, matvec=matrix.dot).H is None
+
+    def test_scaled_operators(self):
+        operator = DiagonalOperator(diag)
+        x = rng.random(ncols)
+
+        scaled1 = 3.0 * operator
+        scaled2 = 3.0 * operator
+        assert scaled1 is not scaled2
+
+        np.testing.assert_allclose(
+            scaled1 * x, 3.0 * diag * x, rtol=1.0e-12, atol=1.0e-14
+        )
+
+        assert scaled1.nMatvec == 1
+        assert scaled2.nMatvec == 0
+
+    def test_zero_scaling(self):
+        operator = MatrixLinearOperator(matrix)
+        x = rng.random(ncols)
+        y = rng.random(nrows)
+
+        scaled = 0 * operator
+        assert isinstance(scaled, ZeroOperator)
+
+        for product in [scaled * x, scaled.H * y]:
+            assert product.flags.writeable
+            product += 1.0
+            np.testing.assert_array_equal(product, 1.0)
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            f"{__file__}::TestMatvecOut",
+            "-v",
+            "-s",
+        ]
+    )
+
+    pytest.main(
+        [
+            f"{__file__}::TestMatrixSymmetry",
+            "-v",
+            "-s",
+        ]
+    )
+
+    pytest.main(
+        [
+            f"{__file__}::TestAdjointAndScaling",
+            "-v",
+            "-s",
+        ]
+    )
@@ -0,0 +1,117 @@
+############################ TEST DESCRIPTION ############################
+#
+# Test defined here are related to the MPI utilities of BrahMap.
+#
+# - class `TestShutdown`:
+#
+#   -   `test_shutdown`: tests whether `brahmap.shutdown()` finalizes MPI
+# right away, and whether the exit of the interpreter goes smoothly after
+# that. Since MPI cannot be initialized again once finalized, the test is
+# run in a separate python process.
+#
+# - class `TestDefaultNumThreads`:
+#
+#   -   `test_default_num_threads`: tests the number of threads that BrahMap
+# sets at import for the OpenMP and BLAS libraries, with a single MPI process.
+# The variables already set are to be left untouched, while the others are
+# to be set to the number of cores the process is allowed to run on. It is
+# run in a separate python process, as the variables are set at import.
+#
+###########################################################################
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+shutdown_script = """
+from mpi4py import MPI
+import brahmap
+
+assert MPI.Is_initialized()
+brahmap.shutdown()
+assert MPI.Is_finalized()
+
+# Calling it once more does nothing
+brahmap.shutdown()
+print("done")
+"""
+
+
+threads_script = """
+import os
+import brahmap
+
+assert os.environ["OMP_NUM_THREADS"] == "3"
+assert os.environ["OPENBLAS_NUM_THREADS"] == str(len(os.sched_getaffinity(0)))
+print("done")
+"""
+
+
+def singleton_env():
+    """Returns the environment for a child process, without the variables of
+    the MPI launcher running the test suite, if any, so that the child runs as
+    an MPI singleton"""
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith(("OMPI_", "PMIX_", "PMI_", "MPI_", "HYDRA_"))
+    }
+
+
+class TestShutdown:
+    def test_shutdown(self):
+        env = singleton_env()
+
+        result = subprocess.run(
+            [sys.executable, "-c", shutdown_script],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "done"
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "sched_getaffinity"),
+    reason="The CPU affinity is not available on this platform",
+)
+class TestDefaultNumThreads:
+    def test_default_num_threads(self):
+        env = singleton_env()
+        env.pop("BRAHMAP_LAZY_MPI", None)
+        env.pop("OPENBLAS_NUM_THREADS", None)
+        env["OMP_NUM_THREADS"] = "3"
+
+        result = subprocess.run(
+            [sys.executable, "-c", threads_script],
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "done"
+
+
+if __name__ == "__main__":
+    pytest.main(
+        [
+            f"{__file__}::TestShutdown",
+            "-v",
+            "-s",
+        ]
+    )
+
+    pytest.main(
+        [
+            f"{__file__}::TestDefaultNumThreads",
+            "-v",
+            "-s",
+        ]
+    )